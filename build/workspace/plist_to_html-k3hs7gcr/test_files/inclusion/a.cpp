@@ -0,0 +1,5 @@
+#include "f.h"
+
+int a() {
+  foo();
+}
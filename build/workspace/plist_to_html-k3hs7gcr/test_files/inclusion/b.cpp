@@ -0,0 +1,5 @@
+#include "f.h"
+
+int b() {
+  return foo();
+}
@@ -0,0 +1,8 @@
+#ifndef F_H
+#define F_H
+
+int foo() {
+  return sizeof(42);
+}
+
+#endif
@@ -150,9 +150,23 @@ class HtmlBuilder:
             os.path.join(self.layout_dir, 'statistics.html')))
 
         # Get the content of the HTML layout dependencies.
-        self._tag_contents = {}
+        self._layout_tag_contents = {}
         for tag, filepath in self._layout_tag_files.items():
-            self._tag_contents[tag] = get_file_content(filepath)
+            self._layout_tag_contents[tag] = get_file_content(filepath)
+
+        self._tag_contents = dict(self._layout_tag_contents)
+
+    def reset(self):
+        """
+        Drop every processed report and file source and restore the loaded
+        layout dependencies.
+
+        The builder gets new containers for its state instead of clearing the
+        old ones, so containers shared with other builders are not modified.
+        """
+        self.generated_html_reports = {}
+        self.files = {}
+        self._tag_contents = dict(self._layout_tag_contents)
 
     def get_severity(self, checker_name: str) -> str:
         """ Returns severity level for the given checker name. """
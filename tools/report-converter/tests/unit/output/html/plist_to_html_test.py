@@ -6,60 +6,104 @@
 #
 # -------------------------------------------------------------------------
 
-import glob
+import copy
 import os
-import re
 import shutil
 import unittest
 
-from typing import ClassVar
+from concurrent.futures import ThreadPoolExecutor
+from typing import ClassVar, Dict, List, Optional
 
 from libtest import env
 
 from codechecker_report_converter.report.output.html import \
     html as report_to_html
-from codechecker_report_converter.report import report_file, \
+from codechecker_report_converter.report import Report, report_file, \
     reports as reports_helper
 
 
+TEST_PROJ_ROOT: Optional[str] = None
+
+# Prefix of the report links in the generated index.html file.
+REPORT_LINK = b'"link": "'
+
+
 def get_project_path(test_project) -> str:
     """ Return project path for the given project. """
-    return os.path.join(env.test_proj_root(), test_project)
+    assert TEST_PROJ_ROOT, "Test project root is not set up."
+    return os.path.join(TEST_PROJ_ROOT, test_project)
+
+
+def prepare_test_project(project_path: str, test_project_path: str):
+    """
+    Copy the given project to the test workspace and replace the file path
+    placeholder in the plist files of the project.
+    """
+    # Only the file contents are needed, so skip copying the metadata.
+    shutil.copytree(project_path, test_project_path,
+                    copy_function=shutil.copyfile)
+
+    for test_file in os.listdir(test_project_path):
+        if test_file.endswith(".plist"):
+            test_file_path = os.path.join(test_project_path, test_file)
+            with open(test_file_path, 'rb') as plist_file:
+                content = plist_file.read()
+
+            if b"$FILE_PATH$" not in content:
+                continue
+
+            new_content = content.replace(
+                b"$FILE_PATH$", test_project_path.encode('utf-8'))
+            with open(test_file_path, 'wb') as plist_file:
+                plist_file.write(new_content)
 
 
 class PlistToHtmlTest(unittest.TestCase):
     test_workspace: ClassVar[str]
     layout_dir: ClassVar[str]
+    layout_html_builder: ClassVar[report_to_html.HtmlBuilder]
+    reports_cache: ClassVar[Dict[str, List[Report]]]
 
     def setup_class(self):
         """ Initialize test files. """
 
-        global TEST_WORKSPACE
+        self.layout_dir = os.environ['LAYOUT_DIR']
+
+        # Loading the layout files is the same for every test case, so do it
+        # only once and create new builders from this one. It is done before
+        # creating the workspace, so a broken layout directory doesn't leave
+        # a workspace behind.
+        self.layout_html_builder = report_to_html.HtmlBuilder(self.layout_dir)
+
+        global TEST_WORKSPACE, TEST_PROJ_ROOT
         TEST_WORKSPACE = env.get_workspace('plist_to_html')
+        TEST_PROJ_ROOT = env.test_proj_root()
 
         os.environ['TEST_WORKSPACE'] = TEST_WORKSPACE
 
         self.test_workspace = os.environ['TEST_WORKSPACE']
-        self.layout_dir = os.environ['LAYOUT_DIR']
+
+        # Multiple test cases use the same plist files, so parse them only
+        # once.
+        self.reports_cache = {}
 
         test_file_dir_path = os.path.join(self.test_workspace, "test_files")
 
-        test_projects = ['notes', 'macros', 'simple', 'inclusion']
-        for test_project in test_projects:
-            test_project_path = os.path.join(test_file_dir_path, test_project)
-            shutil.copytree(get_project_path(test_project), test_project_path)
-
-            for test_file in os.listdir(test_project_path):
-                if test_file.endswith(".plist"):
-                    test_file_path = os.path.join(test_project_path, test_file)
-                    with open(test_file_path, 'r+',
-                              encoding='utf-8', errors='ignore') as plist_file:
-                        content = plist_file.read()
-                        new_content = content.replace("$FILE_PATH$",
-                                                      test_project_path)
-                        plist_file.seek(0)
-                        plist_file.truncate()
-                        plist_file.write(new_content)
+        test_projects = [
+            (get_project_path(test_project),
+             os.path.join(test_file_dir_path, test_project))
+            for test_project in ['notes', 'macros', 'simple', 'inclusion']]
+
+        # The test projects are independent from each other, so prepare them
+        # in parallel.
+        with ThreadPoolExecutor(max_workers=len(test_projects)) as executor:
+            futures = [
+                executor.submit(prepare_test_project, project_path,
+                                test_project_path)
+                for project_path, test_project_path in test_projects]
+
+            for future in futures:
+                future.result()
 
     def teardown_class(self):
         """ Delete the workspace associated with this test. """
@@ -71,23 +115,42 @@ class PlistToHtmlTest(unittest.TestCase):
         print("Removing: " + TEST_WORKSPACE)
         shutil.rmtree(TEST_WORKSPACE)
 
+    def __new_html_builder(self) -> report_to_html.HtmlBuilder:
+        """ Return a html builder without any processed report. """
+        html_builder = copy.copy(self.layout_html_builder)
+        html_builder.reset()
+
+        return html_builder
+
+    def __get_reports(self, plist_file: str) -> List[Report]:
+        """ Return the reports of the given plist file. """
+        if plist_file not in self.reports_cache:
+            self.reports_cache[plist_file] = \
+                report_file.get_reports(plist_file)
+
+        return self.reports_cache[plist_file]
+
     def __test_html_builder(self, proj: str) -> str:
         """
         Test building html file from the given proj's plist file.
         """
-        html_builder = report_to_html.HtmlBuilder(self.layout_dir)
+        html_builder = self.__new_html_builder()
 
         proj_dir = os.path.join(self.test_workspace, 'test_files', proj)
         output_dir = os.path.join(proj_dir, 'html')
-        if not os.path.exists(output_dir):
-            os.mkdir(output_dir)
+        os.makedirs(output_dir, exist_ok=True)
+
+        with os.scandir(proj_dir) as it:
+            plist_entries = [e for e in it
+                             if e.name.endswith(".plist") and e.is_file()]
 
         processed_path_hashes = set()
-        for file_path in glob.glob(os.path.join(proj_dir, f"*.plist")):
-            file_name = os.path.basename(file_path)
+        for plist_entry in plist_entries:
+            file_name = plist_entry.name
+            file_path = plist_entry.path
             output_path = os.path.join(output_dir, f"{file_name}.html")
 
-            reports = report_file.get_reports(file_path)
+            reports = self.__get_reports(file_path)
             reports = reports_helper.skip(
                 reports, processed_path_hashes)
 
@@ -113,9 +176,9 @@ class PlistToHtmlTest(unittest.TestCase):
         proj_notes = os.path.join(self.test_workspace, 'test_files', 'notes')
         plist_file = os.path.join(proj_notes, 'notes.plist')
 
-        reports = report_file.get_reports(plist_file)
+        reports = self.__get_reports(plist_file)
 
-        html_builder = report_to_html.HtmlBuilder(self.layout_dir)
+        html_builder = self.__new_html_builder()
         html_reports, files = html_builder._get_html_reports(reports)
 
         self.assertEqual(len(files), 1)
@@ -132,9 +195,9 @@ class PlistToHtmlTest(unittest.TestCase):
         proj_macros = os.path.join(self.test_workspace, 'test_files', 'macros')
         plist_file = os.path.join(proj_macros, 'macros.plist')
 
-        reports = report_file.get_reports(plist_file)
+        reports = self.__get_reports(plist_file)
 
-        html_builder = report_to_html.HtmlBuilder(self.layout_dir)
+        html_builder = self.__new_html_builder()
         html_reports, files = html_builder._get_html_reports(reports)
 
         self.assertEqual(len(files), 1)
@@ -154,9 +217,9 @@ class PlistToHtmlTest(unittest.TestCase):
         proj_simple = os.path.join(self.test_workspace, 'test_files', 'simple')
         plist_file = os.path.join(proj_simple, 'simple.plist')
 
-        reports = report_file.get_reports(plist_file)
+        reports = self.__get_reports(plist_file)
 
-        html_builder = report_to_html.HtmlBuilder(self.layout_dir)
+        html_builder = self.__new_html_builder()
         html_reports, files = html_builder._get_html_reports(reports)
 
         self.assertEqual(len(files), 1)
@@ -174,6 +237,36 @@ class PlistToHtmlTest(unittest.TestCase):
         self.assertEqual(len(divide_zero['macros']), 0)
         self.assertGreaterEqual(len(divide_zero['events']), 1)
 
+    def test_new_html_builder_is_independent(self):
+        """ Test that html builders don't share their state. """
+        layout_html_builder = self.layout_html_builder
+        layout_tag_contents = dict(layout_html_builder._tag_contents)
+
+        proj_notes = os.path.join(self.test_workspace, 'test_files', 'notes')
+        plist_file = os.path.join(proj_notes, 'notes.plist')
+        output_dir = os.path.join(self.test_workspace, 'independent_builder')
+        os.makedirs(output_dir, exist_ok=True)
+
+        html_builder = self.__new_html_builder()
+        report_to_html.convert(plist_file, self.__get_reports(plist_file),
+                               output_dir, html_builder)
+        html_builder.create_index_html(output_dir)
+        html_builder.create_statistics_html(output_dir)
+
+        self.assertTrue(html_builder.generated_html_reports)
+        self.assertTrue(html_builder.files)
+        self.assertNotEqual(html_builder._tag_contents, layout_tag_contents)
+
+        self.assertEqual(layout_html_builder._tag_contents,
+                         layout_tag_contents)
+        self.assertEqual(layout_html_builder.files, {})
+        self.assertEqual(layout_html_builder.generated_html_reports, {})
+
+        new_html_builder = self.__new_html_builder()
+        self.assertEqual(new_html_builder._tag_contents, layout_tag_contents)
+        self.assertEqual(new_html_builder.files, {})
+        self.assertEqual(new_html_builder.generated_html_reports, {})
+
     def test_html_builder(self):
         """ Test building html files from plist files on multiple projects. """
         self.__test_html_builder('notes')
@@ -185,11 +278,11 @@ class PlistToHtmlTest(unittest.TestCase):
         output_dir = self.__test_html_builder('inclusion')
         index_html = os.path.join(output_dir, "index.html")
 
-        with open(index_html, 'r', encoding="utf-8", errors="ignore") as f:
+        with open(index_html, 'rb') as f:
             content = f.read()
 
-            # There are 3 reports in the test file.
-            self.assertEqual(len(re.findall('"link": "', content)), 3)
-            # The links should be relative so the static HTML folder is
-            # portable.
-            self.assertNotIn('"link": "/', content)
+        # There are 3 reports in the test file.
+        self.assertEqual(content.count(REPORT_LINK), 3)
+        # The links should be relative so the static HTML folder is
+        # portable.
+        self.assertNotIn(REPORT_LINK + b'/', content)